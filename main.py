@@ -1,74 +1,61 @@
+import numpy as np
 import pandas as pd
-
-# Tu función para parsear números con comas
-def parse_number(value):
-    if pd.isna(value):
-        # Si el tipo es NaN, no podemos saber el multiplicador. 
-        # Asumir 1.0 (neutral) es lo más seguro.
-        return 1.0 
-    if isinstance(value, str):
-        value = value.replace(',', '.')
-    
-    # Manejar el caso de que el valor sea un string vacío o no numérico
-    try:
-        return float(value)
-    except ValueError:
-        return 1.0 # Asumir neutral si el dato es inválido
-
-def rank_pokemon_meta(csv_file_path):
+from numba import njit, prange
+
+# Tabla de tipos: TYPE_CHART[atacante, defensor] es el multiplicador de daño de
+# un ataque de un tipo contra un Pokémon mono-tipo. Filas y columnas siguen el
+# orden alfabético de 'type_columns'. Contra un Pokémon de doble tipo el
+# multiplicador es el producto de ambas columnas.
+TYPE_CHART = np.array([
+    # BUG DAR DRA ELE FAI FIG FIR FLY GHO GRA GRO ICE NOR POI PSY ROC STE WAT
+    [ 1,  2,  1,  1, .5, .5, .5, .5, .5,  2,  1,  1,  1, .5,  2,  1, .5,  1], # bug
+    [ 1, .5,  1,  1, .5, .5,  1,  1,  2,  1,  1,  1,  1,  1,  2,  1,  1,  1], # dark
+    [ 1,  1,  2,  1,  0,  1,  1,  1,  1,  1,  1,  1,  1,  1,  1,  1, .5,  1], # dragon
+    [ 1,  1, .5, .5,  1,  1,  1,  2,  1, .5,  0,  1,  1,  1,  1,  1,  1,  2], # electric
+    [ 1,  2,  2,  1,  1,  2, .5,  1,  1,  1,  1,  1,  1, .5,  1,  1, .5,  1], # fairy
+    [.5,  2,  1,  1, .5,  1,  1, .5,  0,  1,  1,  2,  2, .5, .5,  2,  2,  1], # fighting
+    [ 2,  1, .5,  1,  1,  1, .5,  1,  1,  2,  1,  2,  1,  1,  1, .5,  2, .5], # fire
+    [ 2,  1,  1, .5,  1,  2,  1,  1,  1,  2,  1,  1,  1,  1,  1, .5, .5,  1], # flying
+    [ 1, .5,  1,  1,  1,  1,  1,  1,  2,  1,  1,  1,  0,  1,  2,  1,  1,  1], # ghost
+    [.5,  1, .5,  1,  1,  1, .5, .5,  1, .5,  2,  1,  1, .5,  1,  2, .5,  2], # grass
+    [.5,  1,  1,  2,  1,  1,  2,  0,  1, .5,  1,  1,  1,  2,  1,  2,  2,  1], # ground
+    [ 1,  1,  2,  1,  1,  1, .5,  2,  1,  2,  2, .5,  1,  1,  1,  1, .5, .5], # ice
+    [ 1,  1,  1,  1,  1,  1,  1,  1,  0,  1,  1,  1,  1,  1,  1, .5, .5,  1], # normal
+    [ 1,  1,  1,  1,  2,  1,  1,  1, .5,  2, .5,  1,  1, .5,  1, .5,  0,  1], # poison
+    [ 1,  0,  1,  1,  1,  2,  1,  1,  1,  1,  1,  1,  1,  2, .5,  1, .5,  1], # psychic
+    [ 2,  1,  1,  1,  1, .5,  2,  2,  1,  1, .5,  2,  1,  1,  1,  1, .5,  1], # rock
+    [ 1,  1,  1, .5,  2,  1, .5,  1,  1,  1,  1,  2,  1,  1,  1,  2, .5, .5], # steel
+    [ 1,  1, .5,  1,  1,  1,  2,  1,  1, .5,  2,  1,  1,  1,  1,  2,  1, .5], # water
+], dtype=np.float32)
+
+@njit(cache=True)
+def effectiveness(chart, attack_type, t1, t2, has_t2, b):
     """
-    Carga un CSV de Pokémon, calcula un ranking de meta y genera un
-    informe detallado de matchups.
+    Multiplicador de daño de un ataque de tipo 'attack_type' contra el Pokémon 'b'.
     """
-    
-    try:
-        df = pd.read_csv(csv_file_path)
-    except FileNotFoundError:
-        print(f"Error: No se encontró el archivo '{csv_file_path}'")
-        return
-
-    # Nombres de columna de tipo (con tu corrección 'fighting')
-    type_columns = [
-        'bug', 'dark', 'dragon', 'electric', 'fairy', 'fighting', 'fire', 
-        'flying', 'ghost', 'grass', 'ground', 'ice', 'normal', 'poison', 
-        'psychic', 'rock', 'steel', 'water'
-    ]
-    
-    pokemon_list_df = df.copy()
-
-    # --- NUEVO: Lista para guardar CADA matchup individual ---
-    all_matchups_data = [] 
-    
-    meta_scores = {}
+    mult = chart[attack_type, t1[b]]
+    if has_t2[b]:
+        mult *= chart[attack_type, t2[b]]
+    return mult
 
-    # --- El Corazón del Algoritmo ---
-    for index_A, row_A in pokemon_list_df.iterrows():
-        pokemon_A_name = row_A['name']
-        type1_A = row_A['type1']
-        type2_A = row_A['type2']
-        
-        defensive_profile_A = row_A[type_columns]
-        current_score = 0
-
-        # Itera por cada *oponente* (Pokémon B)
-        for index_B, row_B in pokemon_list_df.iterrows():
-            if index_A == index_B:
-                continue
-
-            pokemon_B_name = row_B['name']
-            type1_B = row_B['type1']
-            type2_B = row_B['type2']
-            defensive_profile_B = row_B[type_columns]
+@njit(parallel=True, fastmath=True, cache=True)
+def score_matchups(chart, t1, t2, has_t2):
+    """
+    Calcula la matriz N x N de scores de matchup (A vs B) a partir de la
+    tabla de tipos y los índices de tipo de cada Pokémon.
+    """
+    n = t1.shape[0]
+    scores = np.zeros((n, n), dtype=np.int8) # Los scores viven en {-2, ..., 2}
 
-            # --- Lógica de Puntuación (Refinada) ---
-            
+    # Cada par {A, B} se evalúa una sola vez (b > a). Cada Pokémon A es
+    # independiente: su hilo escribe scores[a, b] y scores[b, a] solo para b > a.
+    for a in prange(n):
+        for b in range(a + 1, n):
             # 1. Puntos Ofensivos (A ataca a B)
-            off_mult_1 = parse_number(defensive_profile_B.get(type1_A, 1.0))
-            off_mult_2 = 1.0
-            if pd.notna(type2_A):
-                off_mult_2 = parse_number(defensive_profile_B.get(type2_A, 1.0))
+            off_mult_1 = effectiveness(chart, t1[a], t1, t2, has_t2, b)
+            off_mult_2 = effectiveness(chart, t2[a], t1, t2, has_t2, b) if has_t2[a] else 1.0
             best_offense = max(off_mult_1, off_mult_2)
-            
+
             offensive_points = 0
             if best_offense >= 2:
                 offensive_points = 1
@@ -76,10 +63,8 @@ def rank_pokemon_meta(csv_file_path):
                 offensive_points = -1
 
             # 2. Puntos Defensivos (B ataca a A)
-            def_mult_1 = parse_number(defensive_profile_A.get(type1_B, 1.0))
-            def_mult_2 = 1.0
-            if pd.notna(type2_B):
-                def_mult_2 = parse_number(defensive_profile_A.get(type2_B, 1.0))
+            def_mult_1 = effectiveness(chart, t1[b], t1, t2, has_t2, a)
+            def_mult_2 = effectiveness(chart, t2[b], t1, t2, has_t2, a) if has_t2[b] else 1.0
             worst_weakness = max(def_mult_1, def_mult_2)
 
             defensive_points = 0
@@ -88,20 +73,86 @@ def rank_pokemon_meta(csv_file_path):
             elif worst_weakness <= 0.5:
                 defensive_points = 1
 
-            # --- NUEVO: Calcular y guardar el score de este matchup ---
-            # Puntuación final del matchup A vs B
-            individual_score = offensive_points + defensive_points
-            
-            all_matchups_data.append({
-                'Pokemon_A': pokemon_A_name,
-                'Pokemon_B': pokemon_B_name,
-                'Matchup_Score': individual_score
-            })
+            scores[a, b] = offensive_points + defensive_points
 
-            # Añadir al meta-score total de Pokémon A
-            current_score += individual_score
+            # El matchup B vs A es el mismo con los papeles invertidos: los
+            # puntos ofensivos de A son los defensivos de B (y viceversa).
+            scores[b, a] = -scores[a, b]
 
-        meta_scores[pokemon_A_name] = current_score
+    return scores
+
+def format_matchup_lines(matchups):
+    """
+    Da formato de texto a un conjunto de matchups y los agrupa por Pokémon A:
+    devuelve una Serie (índice = Pokémon A) con todas sus líneas ya unidas.
+    """
+    lines = (
+        "      vs " + matchups['Pokemon_B'].astype(str).str.ljust(15)
+        + " (Score: " + matchups['Matchup_Score'].astype(str) + ")\n"
+    )
+    return lines.groupby(matchups['Pokemon_A'], observed=True, sort=False).agg(''.join)
+
+def rank_pokemon_meta(csv_file_path):
+    """
+    Carga un CSV de Pokémon, calcula un ranking de meta y genera un
+    informe detallado de matchups.
+    """
+    
+    # Nombres de columna de tipo (con tu corrección 'fighting')
+    type_columns = [
+        'bug', 'dark', 'dragon', 'electric', 'fairy', 'fighting', 'fire', 
+        'flying', 'ghost', 'grass', 'ground', 'ice', 'normal', 'poison', 
+        'psychic', 'rock', 'steel', 'water'
+    ]
+    
+    # Solo necesitamos el nombre y los tipos: el perfil defensivo de cada
+    # Pokémon queda determinado por sus tipos (ver TYPE_CHART).
+    try:
+        df = pd.read_csv(
+            csv_file_path,
+            usecols=['name', 'type1', 'type2'],
+            dtype={'name': 'string', 'type1': 'string', 'type2': 'string'}
+        )
+    except FileNotFoundError:
+        print(f"Error: No se encontró el archivo '{csv_file_path}'")
+        return
+
+    # Cada Pokémon identifica una fila y una columna de la matriz de matchups
+    if df['name'].isna().any():
+        print(f"Error: Hay Pokémon sin nombre en '{csv_file_path}' (filas: {df.index[df['name'].isna()].tolist()})")
+        return
+    if not df['name'].is_unique:
+        duplicated_names = df.loc[df['name'].duplicated(), 'name'].unique().tolist()
+        print(f"Error: Hay Pokémon repetidos en '{csv_file_path}': {', '.join(duplicated_names)}")
+        return
+
+    # Pasar los tipos a 'category' con las categorías en el orden de
+    # 'type_columns', así sus códigos son los índices dentro de TYPE_CHART.
+    # Un tipo que no está en 'type_columns' (p. ej. 'Fire' o una errata)
+    # quedaría como NaN (código -1), así que lo detectamos antes de seguir.
+    type_dtype = pd.CategoricalDtype(type_columns)
+    type1 = df['type1'].astype(type_dtype)
+    type2 = df['type2'].astype(type_dtype)
+    invalid_types = type1.isna() | (type2.isna() & df['type2'].notna())
+    if invalid_types.any():
+        print("Error: Tipos no reconocidos en las siguientes filas:")
+        print(df.loc[invalid_types, ['name', 'type1', 'type2']])
+        return
+
+    # --- Preparar los datos como arrays NumPy (una sola vez) ---
+    pokemon_names = df['name'].to_numpy()
+
+    # Índices de los tipos de cada Pokémon dentro de 'type_columns' (-1 = sin segundo tipo)
+    t1 = type1.cat.codes.to_numpy()
+    t2 = type2.cat.codes.to_numpy()
+    has_t2 = t2 >= 0
+
+    # --- El Corazón del Algoritmo (compilado con Numba) ---
+    # Puntuación final de cada matchup A vs B (la diagonal, A vs A, queda en 0)
+    matchup_scores = score_matchups(TYPE_CHART, t1, t2, has_t2)
+
+    # Meta-score total de cada Pokémon A
+    meta_scores = dict(zip(pokemon_names, matchup_scores.sum(axis=1)))
 
     # --- 3. RESULTADOS (Ranking Principal) ---
     ranked_df = pd.DataFrame(meta_scores.items(), columns=['Pokemon', 'Meta_Score'])
@@ -109,15 +160,26 @@ def rank_pokemon_meta(csv_file_path):
     
     # --- NUEVO: 4. PROCESAR Y GUARDAR MATCHUPS ---
     
-    # Convertir la lista de matchups en un DataFrame
-    matchups_df = pd.DataFrame(all_matchups_data)
-    
-    # Guardar el CSV con todos los datos en crudo
+    # Guardar la matriz N x N de scores junto con los nombres (fila 'a' = Pokémon A)
     try:
-        matchups_df.to_csv("all_matchups.csv", index=False, encoding='utf-8')
-        print("\nArchivo 'all_matchups.csv' guardado con éxito.")
+        np.savez_compressed(
+            "all_matchups.npz",
+            scores=matchup_scores,
+            names=np.array(pokemon_names, dtype=str)
+        )
+        print("\nArchivo 'all_matchups.npz' guardado con éxito.")
     except Exception as e:
-        print(f"Error al guardar 'all_matchups.csv': {e}")
+        print(f"Error al guardar 'all_matchups.npz': {e}")
+
+    # DataFrame largo para el informe: una fila por cada celda (a, b) fuera de
+    # la diagonal (sin A vs A), en orden fila por fila
+    a_idx, b_idx = np.nonzero(~np.eye(len(pokemon_names), dtype=bool))
+    pokemon_dtype = pd.CategoricalDtype(pokemon_names) # Nombres como 'category' (códigos enteros + un único diccionario)
+    matchups_df = pd.DataFrame({
+        'Pokemon_A': pd.Categorical.from_codes(a_idx, dtype=pokemon_dtype),
+        'Pokemon_B': pd.Categorical.from_codes(b_idx, dtype=pokemon_dtype),
+        'Matchup_Score': matchup_scores[a_idx, b_idx]
+    })
 
     # --- NUEVO: 5. GENERAR INFORME DE ANÁLISIS .TXT ---
     
@@ -128,27 +190,27 @@ def rank_pokemon_meta(csv_file_path):
             f.write("Matchup Score = (Puntos Ofensivos + Puntos Defensivos)\n")
             f.write("==================================================\n")
 
-            # Iterar por el ranking principal (ordenado por Meta Score)
-            for index, row in ranked_df.iterrows():
-                pokemon_name = row['Pokemon']
-                meta_score = row['Meta_Score']
-                
-                f.write(f"\n# {index + 1}. {pokemon_name.upper()} (Meta Score: {meta_score})\n")
-                
-                # Filtrar todos los matchups de este Pokémon
-                pokemon_matchups = matchups_df[matchups_df['Pokemon_A'] == pokemon_name]
-                
-                # Obtener Top 5 Mejores Matchups
-                top_5 = pokemon_matchups.sort_values(by='Matchup_Score', ascending=False).head(5)
-                f.write("  [+] Mejores 5 Matchups:\n")
-                for _, matchup in top_5.iterrows():
-                    f.write(f"      vs {matchup['Pokemon_B']:<15} (Score: {matchup['Matchup_Score']})\n")
-                    
-                # Obtener Top 5 Peores Matchups
-                worst_5 = pokemon_matchups.sort_values(by='Matchup_Score', ascending=True).head(5)
-                f.write("  [-] Peores 5 Matchups:\n")
-                for _, matchup in worst_5.iterrows():
-                    f.write(f"      vs {matchup['Pokemon_B']:<15} (Score: {matchup['Matchup_Score']})\n")
+            # Calcular de una vez los 5 mejores y 5 peores matchups de cada Pokémon A
+            scores_by_pokemon = matchups_df.groupby('Pokemon_A', sort=False)['Matchup_Score']
+            top_rows = scores_by_pokemon.nlargest(5).index.get_level_values(-1)
+            worst_rows = scores_by_pokemon.nsmallest(5).index.get_level_values(-1)
+
+            best_lines = format_matchup_lines(matchups_df.loc[top_rows])
+            worst_lines = format_matchup_lines(matchups_df.loc[worst_rows])
+
+            # Sin Pokémon no hay bloques que escribir: el informe queda solo con la cabecera
+            if not ranked_df.empty:
+                # Construir el bloque de cada Pokémon en el orden del ranking principal
+                # (ordenado por Meta Score), todo de una vez, sin iterar fila por fila
+                pokemon = ranked_df['Pokemon']
+                rank = pd.Series(range(1, len(ranked_df) + 1), index=ranked_df.index).astype(str)
+                report = (
+                    "\n# " + rank + ". " + pokemon.str.upper()
+                    + " (Meta Score: " + ranked_df['Meta_Score'].astype(str) + ")\n"
+                    + "  [+] Mejores 5 Matchups:\n" + pokemon.map(best_lines).fillna('')
+                    + "  [-] Peores 5 Matchups:\n" + pokemon.map(worst_lines).fillna('')
+                )
+                f.write("".join(report))
         
         print("Archivo 'matchup_analysis.txt' guardado con éxito.")
 
@@ -1,8 +1,8 @@
-import pandas as pd
+import numpy as np
 import gurobipy as gp
 from gurobipy import GRB
 
-def optimize_pokemon_team(matchups_csv_path, team_size=3, num_solutions_to_find=5):
+def optimize_pokemon_team(matchups_npz_path, team_size=3, num_solutions_to_find=5):
     """
     Usa Gurobi para encontrar el equipo de Pokémon de tamaño 'team_size'
     que maximiza la cobertura del metagame.
@@ -13,15 +13,13 @@ def optimize_pokemon_team(matchups_csv_path, team_size=3, num_solutions_to_find=
     
     # --- 1. Cargar y Preparar los Datos ---
     try:
-        df = pd.read_csv(matchups_csv_path)
+        data = np.load(matchups_npz_path)
     except FileNotFoundError:
-        print(f"Error: No se encontró el archivo '{matchups_csv_path}'")
+        print(f"Error: No se encontró el archivo '{matchups_npz_path}'")
         return
 
-    pokemon_list = list(df['Pokemon_A'].unique())
-    scores = {}
-    for row in df.itertuples():
-        scores[(row.Pokemon_A, row.Pokemon_B)] = row.Matchup_Score
+    pokemon_list = data['names'].tolist()
+    S = data['scores']
 
     print(f"Optimizando un equipo de {team_size} de un pool de {len(pokemon_list)} Pokémon.")
 
@@ -32,30 +30,31 @@ def optimize_pokemon_team(matchups_csv_path, team_size=3, num_solutions_to_find=
     # 5 soluciones * 50s = 250s (4 min 10 seg) en total como máximo.
     m.setParam('TimeLimit', 50)
 
-    M_NEG = -1000.0 
+    levels = np.unique(S).astype(float)
+    pokemon_idx = {name: k for k, name in enumerate(pokemon_list)}
+    n = len(pokemon_list)
 
-    # --- 3. Crear Variables de Decisión ---
-    x = m.addVars(pokemon_list, vtype=GRB.BINARY, name="x")
-    y = m.addVars(pokemon_list, vtype=GRB.CONTINUOUS, lb=M_NEG, name="y")
-    z = m.addVars(pokemon_list, pokemon_list, vtype=GRB.CONTINUOUS, lb=M_NEG, name="z")
+    # --- 3. Crear Variables de Decisión (API matricial) ---
+    x = m.addMVar(n, vtype=GRB.BINARY, name="x")
+    y = m.addMVar(n, vtype=GRB.CONTINUOUS, lb=-GRB.INFINITY, name="y")
+    w = m.addMVar((n, len(levels)), vtype=GRB.CONTINUOUS, lb=0, ub=1, name="w")
 
     # --- 4. Definir las Restricciones ---
-    m.addConstr(gp.quicksum(x[i] for i in pokemon_list) == team_size, "TeamSize")
-    m.addConstr(x['Oshawott'] == 0, "No_Oshawott")
-    m.addConstr(x['Snivy'] == 0, "No_Snivy")
-    #    m.addConstr(x['Purrloin'] == 1, "Yes_Purrloin")
+    m.addConstr(x.sum() == team_size, "TeamSize")
+    m.addConstr(x[pokemon_idx['Oshawott']] == 0, "No_Oshawott")
+    m.addConstr(x[pokemon_idx['Snivy']] == 0, "No_Snivy")
+    #    m.addConstr(x[pokemon_idx['Purrloin']] == 1, "Yes_Purrloin")
 
-    for j in pokemon_list:
-        z_list_for_j = []
-        for i in pokemon_list:
-            s_ij = scores.get((i, j), 0)
-            m.addGenConstrIndicator(x[i], 1, z[i, j] == s_ij, name=f"z_on_{i}_{j}")
-            m.addGenConstrIndicator(x[i], 0, z[i, j] == M_NEG, name=f"z_off_{i}_{j}")
-            z_list_for_j.append(z[i, j])
-        m.addGenConstrMax(y[j], z_list_for_j, name=f"y_max_{j}")
+    # y[j] = mejor score del equipo contra 'j', elegido entre los niveles
+    # alcanzables por algún Pokémon seleccionado (ver team_build.py)
+    m.addConstr(w.sum(axis=1) == 1, name="level")
+    for l, v in enumerate(levels):
+        A = (S >= v).T.astype(float)
+        m.addConstr(w[:, l] <= A @ x, name=f"level_{int(v)}")
+    m.addConstr(y == w @ levels, name="y")
 
     # --- 5. Definir la Función Objetivo ---
-    m.setObjective(gp.quicksum(y[j] for j in pokemon_list), GRB.MAXIMIZE)
+    m.setObjective(y.sum(), GRB.MAXIMIZE)
 
     # --- 6. y 7. Resolver Iterativamente y Mostrar Resultados ---
     
@@ -83,22 +82,39 @@ def optimize_pokemon_team(matchups_csv_path, team_size=3, num_solutions_to_find=
             print(f"Puntuación Total de Cobertura: {m.ObjVal:.2f}")
             print(f"El equipo encontrado es:")
             
+            x_values = x.X
+            
             current_team = []
-            for i in pokemon_list:
-                if x[i].X > 0.5: # Si la variable binaria es 1
-                    current_team.append(i)
-                    print(f"   - {i}")
+            for i, name in enumerate(pokemon_list):
+                if x_values[i] > 0.5: # Si la variable binaria es 1
+                    current_team.append(name)
+                    print(f"   - {name}")
             
             all_teams_found.append(current_team)
             
             # --- LA MAGIA: Añadir la restricción de "corte" ---
             # Obtenemos las variables 'x' de los Pokémon en el equipo actual
-            team_vars = [x[p_name] for p_name in current_team]
+            team_vars = x[[pokemon_idx[p_name] for p_name in current_team]]
             
             # Añadimos una restricción que dice:
             # "La suma de estas 3 variables no puede ser 3 de nuevo"
             # O, lo que es lo mismo: "debe ser 2 o menos"
-            m.addConstr(gp.quicksum(team_vars) <= team_size - 1, f"cut_solution_{sol_num}")
+            m.addConstr(team_vars.sum() <= team_size - 1, f"cut_solution_{sol_num}")
+            
+            # --- Arranque en caliente para la siguiente búsqueda ---
+            # Reutilizamos el mismo modelo, pero la solución actual ya no es
+            # válida por el corte. Como punto de partida usamos la mejor
+            # solución alternativa que Gurobi guardó en su pool durante esta
+            # búsqueda (y que no sea un equipo ya encontrado). Si no hay
+            # ninguna, la siguiente búsqueda arranca sin solución inicial.
+            x.Start = np.full(n, GRB.UNDEFINED)
+            for pool_index in range(1, m.SolCount):
+                m.setParam(GRB.Param.SolutionNumber, pool_index)
+                candidate = x.Xn > 0.5
+                if not any(all(candidate[pokemon_idx[p]] for p in team) for team in all_teams_found):
+                    x.Start = candidate.astype(float)
+                    break
+            m.setParam(GRB.Param.SolutionNumber, 0)
 
         else:
             # Si Gurobi no encuentra más soluciones, es porque ya no hay
@@ -111,7 +127,7 @@ def optimize_pokemon_team(matchups_csv_path, team_size=3, num_solutions_to_find=
 # --- EJECUCIÓN DEL SCRIPT ---
 if __name__ == "__main__":
     
-    matchups_file = "all_matchups.csv" 
+    matchups_file = "all_matchups.npz" 
     
     # ¡Llamamos a la función pidiendo 5 equipos!
     optimal_teams = optimize_pokemon_team(matchups_file, team_size=3, num_solutions_to_find=5)
@@ -1,8 +1,8 @@
-import pandas as pd
+import numpy as np
 import gurobipy as gp
 from gurobipy import GRB
 
-def optimize_pokemon_team(matchups_csv_path, team_size=3):
+def optimize_pokemon_team(matchups_npz_path, team_size=3):
     """
     Usa Gurobi para encontrar el equipo de Pokémon de tamaño 'team_size'
     que maximiza la cobertura del metagame.
@@ -10,19 +10,17 @@ def optimize_pokemon_team(matchups_csv_path, team_size=3):
     
     # --- 1. Cargar y Preparar los Datos ---
     try:
-        df = pd.read_csv(matchups_csv_path)
+        data = np.load(matchups_npz_path)
     except FileNotFoundError:
-        print(f"Error: No se encontró el archivo '{matchups_csv_path}'")
+        print(f"Error: No se encontró el archivo '{matchups_npz_path}'")
         return
 
-    # Obtener la lista de todos los Pokémon únicos
-    pokemon_list = list(df['Pokemon_A'].unique())
+    # Obtener la lista de todos los Pokémon (en el orden de la matriz)
+    pokemon_list = data['names'].tolist()
     
-    # Crear un diccionario con los scores (i, j) -> score
-    # Esto es 's_ij' en nuestro modelo: el score de Pokémon 'i' vs 'j'
-    scores = {}
-    for row in df.itertuples():
-        scores[(row.Pokemon_A, row.Pokemon_B)] = row.Matchup_Score
+    # Matriz de scores N x N: S[a, b] es 's_ij' en nuestro modelo,
+    # el score del Pokémon en la posición 'a' vs el de la posición 'b'
+    S = data['scores']
 
     print(f"Optimizando un equipo de {team_size} de un pool de {len(pokemon_list)} Pokémon.")
 
@@ -38,63 +36,62 @@ def optimize_pokemon_team(matchups_csv_path, team_size=3):
     m.setParam(GRB.Param.PoolSearchMode, 2) 
     # --- FIN LÍNEAS NUEVAS ---
 
-    # Un valor "infinito negativo" para matchups de Pokémon no seleccionados
-    M_NEG = -1000.0 
+    # Niveles de score posibles (S solo toma valores enteros en {-2, ..., 2})
+    levels = np.unique(S).astype(float)
 
-    # --- 3. Crear Variables de Decisión ---
+    # Posición de cada Pokémon en la matriz S (y en los vectores de variables)
+    pokemon_idx = {name: k for k, name in enumerate(pokemon_list)}
+    n = len(pokemon_list)
+
+    # --- 3. Crear Variables de Decisión (API matricial) ---
     
-    # x[i]: Variable binaria, 1 si elegimos Pokémon 'i', 0 si no.
-    x = m.addVars(pokemon_list, vtype=GRB.BINARY, name="x")
+    # x[i]: Variable binaria, 1 si elegimos el Pokémon en la posición 'i', 0 si no.
+    x = m.addMVar(n, vtype=GRB.BINARY, name="x")
     
     # y[j]: Variable continua, representará el MEJOR score que nuestro
     #       equipo tiene contra el oponente 'j'.
-    y = m.addVars(pokemon_list, vtype=GRB.CONTINUOUS, lb=M_NEG, name="y")
+    y = m.addMVar(n, vtype=GRB.CONTINUOUS, lb=-GRB.INFINITY, name="y")
     
-    # z[i, j]: Variable continua, representa el score "efectivo" de
-    #          nuestro Pokémon 'i' contra el oponente 'j'.
-    #          Será 'scores[i, j]' si x[i]=1, o M_NEG si x[i]=0.
-    z = m.addVars(pokemon_list, pokemon_list, vtype=GRB.CONTINUOUS, lb=M_NEG, name="z")
+    # w[j, l]: Variable continua en [0, 1], "elige" el nivel de score levels[l]
+    #          contra el oponente 'j'. Como maximizamos, Gurobi activa el nivel
+    #          más alto permitido, así que no hace falta que sea binaria.
+    w = m.addMVar((n, len(levels)), vtype=GRB.CONTINUOUS, lb=0, ub=1, name="w")
 
     # --- 4. Definir las Restricciones ---
     
     # Restricción 1: El tamaño del equipo debe ser exactamente 'team_size'
-    m.addConstr(gp.quicksum(x[i] for i in pokemon_list) == team_size, "TeamSize")
+    m.addConstr(x.sum() == team_size, "TeamSize")
 
     # Restricción 2: No podemos elegir a Oshawott.
-    m.addConstr(x['Oshawott'] == 0, "No_Oshawott")
+    m.addConstr(x[pokemon_idx['Oshawott']] == 0, "No_Oshawott")
     
     # Restricción 3: No podemos elegir a Snivy.
-    m.addConstr(x['Snivy'] == 0, "No_Snivy")
-    m.addConstr(x['Purrloin'] == 1, "Yes_Purrloin")
+    m.addConstr(x[pokemon_idx['Snivy']] == 0, "No_Snivy")
+    m.addConstr(x[pokemon_idx['Purrloin']] == 1, "Yes_Purrloin")
 
     # Restricción X: Obligar a incluir a pokemon Apokemon en el equipo
-    # m.addConstr(x['Apokemon'] == 1, "Must_Have_Apokemon")
+    # m.addConstr(x[pokemon_idx['Apokemon']] == 1, "Must_Have_Apokemon")
 
-    # Restricciones 2 y 3 (El corazón del modelo):
-    # Ligar 'x' con 'z' y 'z' con 'y'
+    # Restricciones 4, 5 y 6 (El corazón del modelo):
+    # Ligar 'x' con 'w' y 'w' con 'y' (modelo lineal, sin indicadores ni 'max')
     
-    for j in pokemon_list: # Para cada oponente 'j'
-        z_list_for_j = []
-        for i in pokemon_list: # Para cada miembro potencial del equipo 'i'
-            
-            s_ij = scores.get((i, j), 0) # Score de i vs j
-            
-            # Restricción 2: Constraints 'Indicador'
-            # Si x[i] = 1 (elegido), entonces z[i, j] = s_ij
-            m.addGenConstrIndicator(x[i], 1, z[i, j] == s_ij, name=f"z_on_{i}_{j}")
-            # Si x[i] = 0 (no elegido), entonces z[i, j] = M_NEG
-            m.addGenConstrIndicator(x[i], 0, z[i, j] == M_NEG, name=f"z_off_{i}_{j}")
-            
-            z_list_for_j.append(z[i, j])
-            
-        # Restricción 3: Constraint 'Max'
-        # y[j] (score vs oponente j) debe ser el MÁXIMO de todos 
-        # los scores efectivos (z) de nuestro equipo contra él.
-        m.addGenConstrMax(y[j], z_list_for_j, name=f"y_max_{j}")
+    # Restricción 4: Exactamente un nivel de score activo contra cada oponente 'j'
+    m.addConstr(w.sum(axis=1) == 1, name="level")
+    
+    # Restricción 5: El nivel 'v' solo puede activarse contra 'j' si elegimos
+    # al menos un Pokémon 'i' con score s_ij >= v. En forma matricial:
+    # w[:, l] <= A @ x, con A[j, i] = 1 si S[i, j] >= levels[l]
+    for l, v in enumerate(levels):
+        A = (S >= v).T.astype(float)
+        m.addConstr(w[:, l] <= A @ x, name=f"level_{int(v)}")
+    
+    # Restricción 6: y[j] (score vs oponente j) es el nivel activo, es decir,
+    # el MÁXIMO score de nuestro equipo contra él.
+    m.addConstr(y == w @ levels, name="y")
 
     # --- 5. Definir la Función Objetivo ---
     # Maximizar la suma de los "mejores" scores contra cada oponente
-    m.setObjective(gp.quicksum(y[j] for j in pokemon_list), GRB.MAXIMIZE)
+    m.setObjective(y.sum(), GRB.MAXIMIZE)
 
     # --- 6. Resolver la Optimización ---
     print("\nIniciando optimización con Gurobi...")
@@ -127,13 +124,15 @@ def optimize_pokemon_team(matchups_csv_path, team_size=3):
             
             print(f"\n--- Equipo #{sol_index + 1} (Score: {score:.2f}) ---")
             
+            # Importante: Usar .Xn para obtener el valor de la variable
+            # de la solución que seleccionamos con SolutionNumber
+            x_values = x.Xn
+            
             team = []
-            for i in pokemon_list:
-                # Importante: Usar .Xn para obtener el valor de la variable
-                # de la solución que seleccionamos con SolutionNumber
-                if x[i].Xn > 0.5: 
-                    team.append(i)
-                    print(f"   - {i}")
+            for i, name in enumerate(pokemon_list):
+                if x_values[i] > 0.5: 
+                    team.append(name)
+                    print(f"   - {name}")
             
             # (Opcional) Si quieres, puedes guardar este equipo en una lista
             # optimal_teams.append(team)
@@ -146,7 +145,7 @@ def optimize_pokemon_team(matchups_csv_path, team_size=3):
 if __name__ == "__main__":
     
     # Nombre del archivo que generamos en el paso anterior
-    matchups_file = "all_matchups.csv" 
+    matchups_file = "all_matchups.npz" 
     
     # ¡Cambiamos a 3!
     optimal_team = optimize_pokemon_team(matchups_file, team_size=3)
\ No newline at end of file